@@ -2,16 +2,29 @@ import smtplib                                  # Import for sending emails
 from email.mime.text import MIMEText            # For creating email body as text
 from email.mime.multipart import MIMEMultipart  # For handling multipart emails (text + attachments)
 from datetime import datetime, timedelta        # For date/time operations
+import threading                                # For guarding the shared model instance
 
 import streamlit as st                                    # Import for Streamlit (UI framework)
-from langchain_ollama import OllamaLLM, OllamaEmbeddings  # For working with Ollama model and embeddings
-from langchain_chroma import Chroma                       # For working with Chroma (vector database)
-from event import create_event                            # Importing the event creation logic from another module
 import re                                                 # For regular expression operations
 import json                                               # For handling JSON data
 
+# Ollama, the Google Calendar client (event) and the prompt template are imported lazily on first use
+from startup import lazy_import, timed                    # Lazy imports with start-up timing
 from document_processing import *                         # Importing from document_processing 
-from chat_template import prompt_template                 # Importing a prompt template for chat 
+
+# Shared Mistral model instance, created on first use (or by the background warm-up thread)
+_llm = None
+_llm_lock = threading.Lock()
+
+# Function to create the Mistral model once and reuse it
+def get_llm():
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            OllamaLLM = lazy_import("langchain_ollama").OllamaLLM
+            with timed("init OllamaLLM(mistral)"):
+                _llm = OllamaLLM(model="mistral")
+        return _llm
 
 # Tool to send an email with appointment details
 def send_email_tool(inputs):
@@ -120,6 +133,7 @@ def create_event_tool_safe(inputs):
 # Actual event creation logic
 def create_event_tool(appointment_date, name, phone, email):
     # Call the event creation function imported from event.py
+    create_event = lazy_import("event").create_event
     response = create_event(appointment_date, name, name, phone, email)
     if response:
         return f"Appointment scheduled for {appointment_date}."  # Return success message
@@ -128,17 +142,15 @@ def create_event_tool(appointment_date, name, phone, email):
 
 # Tool for querying documents in ChromaDB
 def query_document_tool(query_text):
-    embedding_function = OllamaEmbeddings(model="nomic-embed-text")  # Use Ollama embeddings model for text
-    db = Chroma(persist_directory="chroma", embedding_function=embedding_function)  # ChromaDB instance
-
-    # Perform a similarity search in ChromaDB
-    results = db.similarity_search_with_score(query_text, k=5)
+    # Perform a similarity search in ChromaDB, routed to the most relevant partitions
+    results = search_documents(query_text, k=5)
     context_text = "\n\n---\n\n".join([doc.page_content for doc, _score in results])  # Concatenate document content
 
     # Format the prompt with context and query
+    prompt_template = lazy_import("chat_template").prompt_template
     prompt = prompt_template.format(context=context_text, question=query_text)
 
-    model = OllamaLLM(model="mistral")  # Use the Mistral model for generating a response
+    model = get_llm()  # Use the Mistral model for generating a response
     response_text = model.invoke(prompt)  # Get the response from the model
 
     return response_text
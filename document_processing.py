@@ -1,21 +1,198 @@
 
 #Importing the dependencies
-from langchain.text_splitter import RecursiveCharacterTextSplitter  # Split text into smaller chunks
-from langchain.schema import Document                               # Define a schema for documents
-from langchain_ollama import OllamaLLM, OllamaEmbeddings            # Importing Ollama LLM and embedding classes for language model operations
-from langchain_chroma import Chroma                                 # Importing Chroma for vector storage and retrieval
-from langchain_community.document_loaders import PyPDFDirectoryLoader  # Importing PDF loader to extract documents from a directory containing PDFs
+# LangChain, Ollama, Chroma and the PDF loader are imported lazily on first use to keep app start-up fast
+import hashlib                                                      # For disambiguating partition names
+import json                                                         # For the partition index file
+import os                                                           # For partition index and source paths
+import re                                                           # For turning sources/tags into collection names
+import threading                                                    # For guarding the shared model and vector store instances
+from typing import TYPE_CHECKING
 import streamlit as st                                              # Importing streamlit for UI
+from startup import lazy_import, timed                              # Lazy imports with start-up timing
+
+if TYPE_CHECKING:
+    from langchain.schema import Document                           # Define a schema for documents
 
 # Constants for paths used in the application
 CHROMA_PATH = "chroma"  # Path for Chroma vector store
 DATA_PATH = "bigdata"   # Path for the PDF document directory
+PARTITION_INDEX_PATH = os.path.join(CHROMA_PATH, "partitions.json")  # Per-partition centroid summaries
+PARTITIONS_TO_SEARCH = 2  # Number of partitions the router searches when the caller gives no filter
+
+# Shared instances, created on first use (or by the background warm-up thread)
+_embeddings = None
+_embeddings_lock = threading.Lock()
+_chroma_db = None
+_chroma_lock = threading.Lock()
+_partition_dbs = {}
+_partition_index = None
+_partition_router = None
+_partition_index_lock = threading.Lock()
 
 # Embedding function to retrieve embeddings from Ollama
 def get_embedding_function():
-    # Initialize OllamaEmbeddings with a specified model
-    embeddings = OllamaEmbeddings(model="nomic-embed-text")
-    return embeddings
+    global _embeddings
+    with _embeddings_lock:
+        if _embeddings is None:
+            OllamaEmbeddings = lazy_import("langchain_ollama").OllamaEmbeddings
+            # Initialize OllamaEmbeddings with a specified model
+            with timed("init OllamaEmbeddings(nomic-embed-text)"):
+                _embeddings = OllamaEmbeddings(model="nomic-embed-text")
+        return _embeddings
+
+# Function to open the Chroma vector store once and reuse it
+def get_chroma_db():
+    global _chroma_db
+    with _chroma_lock:
+        if _chroma_db is None:
+            Chroma = lazy_import("langchain_chroma").Chroma
+            embedding_function = get_embedding_function()
+            with timed("open Chroma vector store"):
+                _chroma_db = Chroma(persist_directory=CHROMA_PATH, embedding_function=embedding_function)
+        return _chroma_db
+
+# Function to map a source file or tag (e.g. "bigdata/Ch 1.pdf" or "Ch 1") to a partition name
+def partition_name(source_or_tag):
+    key = os.path.normpath(str(source_or_tag))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]  # Keeps "Ch 1.pdf" and "ch_1.pdf" apart
+    stem = os.path.splitext(os.path.basename(key))[0]
+    # Chroma collection names: 3-63 characters, starting and ending with a letter or digit
+    slug = re.sub(r"[^a-z0-9]+", "-", stem.lower())[:48].strip("-") or "unknown"
+    return f"part-{slug}-{digest}"
+
+# Function to open one partition (a Chroma collection) once and reuse it
+def get_partition_db(name):
+    with _chroma_lock:
+        if name not in _partition_dbs:
+            Chroma = lazy_import("langchain_chroma").Chroma
+            embedding_function = get_embedding_function()
+            with timed(f"open Chroma partition {name}"):
+                _partition_dbs[name] = Chroma(
+                    collection_name=name, persist_directory=CHROMA_PATH, embedding_function=embedding_function
+                )
+        return _partition_dbs[name]
+
+# Function to load the partition index: {name: {"source", "count", "centroid"}}
+def load_partition_index():
+    global _partition_index
+    with _partition_index_lock:
+        if _partition_index is None:
+            if os.path.exists(PARTITION_INDEX_PATH):
+                with open(PARTITION_INDEX_PATH) as f:
+                    _partition_index = json.load(f)
+            else:
+                _partition_index = {}  # Not ingested with partitions yet
+        return _partition_index
+
+# Function to save the partition index after ingestion
+def save_partition_index(index):
+    global _partition_index, _partition_router
+    with _partition_index_lock:
+        with open(PARTITION_INDEX_PATH, "w") as f:
+            json.dump(index, f)
+        _partition_index = index
+        _partition_router = None  # Rebuilt from the new centroids on next use
+
+# Function to open every partition (or the single collection for an unpartitioned store)
+def open_vector_store():
+    index = load_partition_index()
+    if not index:
+        return [get_chroma_db()]
+    return [get_partition_db(name) for name in index]
+
+# Function to compute the mean embedding of a partition
+def compute_centroid(embeddings):
+    count = len(embeddings)
+    return [float(sum(column)) / count for column in zip(*embeddings)]
+
+# Function to build the router: partition names and their unit-length centroids as one matrix
+def build_partition_router(index):
+    np = lazy_import("numpy")  # Installed with chromadb
+    names = list(index)
+    matrix = np.array([index[name]["centroid"] for name in names], dtype=np.float32).reshape(len(names), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return names, matrix / norms
+
+# Function to get the router for the saved partition index, built once per index
+def get_partition_router():
+    global _partition_router
+    index = load_partition_index()
+    with _partition_index_lock:
+        if _partition_router is None:
+            _partition_router = build_partition_router(index)
+        return _partition_router
+
+# Router: pick the partitions whose centroids are closest (cosine similarity) to the query
+def rank_partitions(query_embedding, router, top_n=PARTITIONS_TO_SEARCH):
+    np = lazy_import("numpy")
+    names, matrix = router
+    if not names:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    scores = matrix @ (query / norm if norm else query)  # One matrix-vector product for all partitions
+    return [names[i] for i in np.argsort(-scores)[:top_n]]
+
+# Function to resolve a caller's filter (partition names, source paths or tags) to partition names
+def resolve_partitions(requested, index):
+    if isinstance(requested, str):
+        requested = [requested]  # A single name, not a sequence of characters
+    names = []
+    dropped = []
+    for item in requested:
+        if item in index:
+            matches = [item]
+        else:
+            # Match the full source path/tag, or just its file name or stem ("Ch 1.pdf", "Ch 1")
+            wanted = os.path.normpath(str(item)).lower()
+            matches = [
+                name for name, summary in index.items()
+                if wanted in {
+                    os.path.normpath(str(summary["source"])).lower(),
+                    os.path.basename(str(summary["source"])).lower(),
+                    os.path.splitext(os.path.basename(str(summary["source"])))[0].lower(),
+                }
+            ]
+        if matches:
+            names.extend(name for name in matches if name not in names)
+        else:
+            dropped.append(item)
+    return names, dropped
+
+# Function to route a query embedding to partitions, search them and merge the results
+def search_partitions(query_embedding, router, search_partition, k=5, partitions=None):
+    # search_partition(name, query_embedding, k) returns (item, distance) pairs for one partition
+    if partitions is None:
+        partitions = rank_partitions(query_embedding, router)
+    results = []
+    for name in partitions:
+        results.extend(search_partition(name, query_embedding, k))
+    results.sort(key=lambda item: item[1])  # Lower distance is more similar
+    return results[:k]
+
+# Function to search one Chroma partition with a precomputed query embedding
+def _search_partition_db(name, query_embedding, k):
+    return get_partition_db(name).similarity_search_by_vector_with_relevance_scores(query_embedding, k=k)
+
+# Function to search the document store, only scanning the partitions relevant to the query
+def search_documents(query_text, k=5, partitions=None):
+    index = load_partition_index()
+    if not index:
+        # Unpartitioned store: search the single collection
+        return get_chroma_db().similarity_search_with_score(query_text, k=k)
+
+    query_embedding = get_embedding_function().embed_query(query_text)  # Embed once, reuse for every partition
+    if partitions is not None:
+        # Explicit filter from the caller: partition names, source files or tags
+        partitions, dropped = resolve_partitions(partitions, index)
+        if dropped:
+            print(f"Debug: Unknown partitions ignored in search filter: {dropped}")
+        if not partitions:
+            print("Debug: No requested partitions exist, falling back to centroid routing")
+            partitions = None
+
+    return search_partitions(query_embedding, get_partition_router(), _search_partition_db, k=k, partitions=partitions)
 
 # Helper function to process documents (load, split, and store)
 def process_documents():
@@ -26,11 +203,13 @@ def process_documents():
 
 # Function to load documents from a specified directory
 def load_documents():
+    PyPDFDirectoryLoader = lazy_import("langchain_community.document_loaders").PyPDFDirectoryLoader
     document_loader = PyPDFDirectoryLoader(DATA_PATH)  # Initialize PDF loader
     return document_loader.load()  # Load documents from the directory
 
 # Function to split documents into smaller chunks for easier processing
-def split_documents(documents: list[Document]):
+def split_documents(documents: "list[Document]"):
+    RecursiveCharacterTextSplitter = lazy_import("langchain.text_splitter").RecursiveCharacterTextSplitter
     # Initialize text splitter with defined chunk size and overlap
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=800,  # Max size of each chunk
@@ -39,33 +218,56 @@ def split_documents(documents: list[Document]):
     )
     return text_splitter.split_documents(documents)  # Split documents into chunks
 
-# Function to add processed chunks to Chroma vector store
-def add_to_chroma(chunks: list[Document]):
-    # Initialize Chroma database with embedding function
-    db = Chroma(
-        persist_directory=CHROMA_PATH, embedding_function=get_embedding_function()
-    )
-
-    # Calculate chunk IDs and filter out already existing chunks in the database
+# Function to add processed chunks to Chroma, one partition per source file (or "partition" metadata tag)
+def add_to_chroma(chunks: "list[Document]"):
+    # Calculate chunk IDs and group the chunks by partition
     chunks_with_ids = calculate_chunk_ids(chunks)  # Assign IDs to chunks
-    existing_items = db.get(include=[])  # Retrieve existing items in the database
-    existing_ids = set(existing_items["ids"])  # Set of existing document IDs
-    st.write(f"Number of existing documents in DB: {len(existing_ids)}")  # Display number of existing documents
-
-    # Filter out chunks that already exist in the database
-    new_chunks = [chunk for chunk in chunks_with_ids if chunk.metadata["id"] not in existing_ids]
-
-    # Add new chunks to the database if any
-    if new_chunks:
-        st.write(f"Adding new documents: {len(new_chunks)}")
-        new_chunk_ids = [chunk.metadata["id"] for chunk in new_chunks]  # List of new chunk IDs
-        db.add_documents(new_chunks, ids=new_chunk_ids)  # Add new chunks to Chroma
-        db.persist()  # Persist changes to the database
+    chunks_by_partition = {}
+    partition_keys = {}  # Partition name -> source path or tag it was named from
+    for chunk in chunks_with_ids:
+        key = chunk.metadata.get("partition") or chunk.metadata.get("source") or "unknown"
+        name = partition_name(key)
+        chunk.metadata["partition_name"] = name
+        partition_keys[name] = key
+        chunks_by_partition.setdefault(name, []).append(chunk)
+
+    index = dict(load_partition_index())
+    existing_count = 0
+    new_count = 0
+    updated_partitions = 0
+    for name, partition_chunks in chunks_by_partition.items():
+        db = get_partition_db(name)
+
+        # Filter out chunks that already exist in this partition
+        existing_ids = set(db.get(include=[])["ids"])  # Set of existing document IDs
+        existing_count += len(existing_ids)
+        new_chunks = [chunk for chunk in partition_chunks if chunk.metadata["id"] not in existing_ids]
+
+        # Add new chunks to the partition if any (Chroma persists automatically)
+        if new_chunks:
+            new_chunk_ids = [chunk.metadata["id"] for chunk in new_chunks]  # List of new chunk IDs
+            db.add_documents(new_chunks, ids=new_chunk_ids)  # Add new chunks to Chroma
+            new_count += len(new_chunks)
+            updated_partitions += 1
+
+        # Refresh the partition's centroid summary from its stored embeddings
+        if new_chunks or name not in index:
+            embeddings = db.get(include=["embeddings"])["embeddings"]
+            index[name] = {
+                "source": partition_keys[name],
+                "count": len(embeddings),
+                "centroid": compute_centroid(embeddings),
+            }
+
+    st.write(f"Number of existing documents in DB: {existing_count}")  # Display number of existing documents
+    if new_count:
+        st.write(f"Adding new documents: {new_count} across {updated_partitions} partitions")
     else:
         st.write("No new documents to add")  # No new documents to add
+    save_partition_index(index)
 
 # Function to calculate unique IDs for each chunk based on its source and page
-def calculate_chunk_ids(chunks: list[Document]):
+def calculate_chunk_ids(chunks: "list[Document]"):
     last_page_id = None  # Keep track of the last processed page
     current_chunk_index = 0  # Initialize the index for the current chunk
 
@@ -1,60 +1,80 @@
 import streamlit as st
-from langchain.agents import initialize_agent, AgentType
-from langchain.agents import Tool
-from langchain_ollama import OllamaLLM
+from startup import lazy_import, timed, timing_report, start_warmup
 
 # Import custom functions for document processing and agent tools
-from document_processing import *
-from agent_tools import *
+# (LangChain agents and Ollama are imported lazily in initialize_chatbot_agent to keep the first frame fast)
+with timed("import document_processing"):
+    from document_processing import *
+with timed("import agent_tools"):
+    from agent_tools import *
+from tool_cache import ToolCallCache
 
 # Define a list of phrases that trigger appointment booking process
 contact_phrases = ["call me", "book appointment","appointment", "contact me", "i want to book appointment", "reach out", "get in touch"]
 
 # Function to initialize the LangChain agent with various tools
-def initialize_chatbot_agent():
+# tool_cache memoizes repeated tool calls; the caller must call tool_cache.new_turn() before each agent.run
+def initialize_chatbot_agent(tool_cache):
+    agents = lazy_import("langchain.agents")  # Heavy import, deferred until the agent is first needed
+    Tool = agents.Tool
+
     # Define the tools the agent will use
     tools = [
         Tool(
             name="Send Email",  # Tool to send an email
-            func=send_email_tool,  # Function to send confirmation email
+            func=tool_cache.wrap("Send Email", send_email_tool, side_effecting=True),  # Function to send confirmation email
             description="Sends confirmation email to the user. Requires a dictionary with keys: name, phone, email, appointment_date."
         ),
         Tool(
             name="Create Event",  # Tool to create an event
-            func=create_event_tool_safe,  # Function to create event
+            func=tool_cache.wrap("Create Event", create_event_tool_safe, side_effecting=True),  # Function to create event
             description="Creates an event for the user. Requires a dictionary with keys: appointment_date, name, phone, email."
         ),
         Tool(
             name="Query Document",  # Tool to query documents for context
-            func=query_document_tool,  # Function to query document
+            func=tool_cache.wrap("Query Document", query_document_tool),  # Function to query document
             description="Searches the document database for context. Input: query_text."
         ),
         Tool(
             name="Parse Date",  # Tool to parse date or day mentioned by the user
-            func=parse_relative_day_tool,  # Function to parse date
+            func=tool_cache.wrap("Parse Date", parse_relative_day_tool),  # Function to parse date
             description="Parses relative day or date mentioned by the user. Input: user_input."
         ),
     ]
 
     # Initialize the LangChain model
     try:
-        llm = OllamaLLM(model="mistral")  # Specify the model for LangChain
+        llm = get_llm()  # Shared Mistral model, possibly already loaded by the warm-up thread
     except Exception as e:
         raise ValueError(f"Failed to initialize LLM: {e}")
 
     # Initialize the agent with the specified tools and model
     try:
-        agent = initialize_agent(
-            tools,  # List of tools
-            llm,  # LangChain LLM
-            agent_type=AgentType.ZERO_SHOT_REACT_DESCRIPTION,  # Zero-shot agent type
-            verbose=True,  # Enable verbose output
-            handle_parsing_errors=True  # Handle parsing errors gracefully
-        )
+        with timed("init LangChain agent"):
+            agent = agents.initialize_agent(
+                tools,  # List of tools
+                llm,  # LangChain LLM
+                agent_type=agents.AgentType.ZERO_SHOT_REACT_DESCRIPTION,  # Zero-shot agent type
+                verbose=True,  # Enable verbose output
+                handle_parsing_errors=True  # Handle parsing errors gracefully
+            )
         return agent  # Return the initialized agent
     except Exception as e:
         raise ValueError(f"Failed to initialize LangChain agent: {e}")
 
+# Function to get the session's agent, initializing it on first use
+def get_chatbot_agent():
+    if "agent" not in st.session_state:
+        st.session_state.tool_cache = ToolCallCache()  # Tool results are memoized per turn
+        st.session_state.agent = initialize_chatbot_agent(st.session_state.tool_cache)
+    return st.session_state.agent
+
+# Function to run one agent turn with a fresh tool-call cache
+def run_agent_turn(query):
+    agent = get_chatbot_agent()
+    st.session_state.tool_cache.new_turn()  # Results from earlier turns are not reused
+    return agent.run(query)
+
 # Main function to run the chatbot interface
 def main():
     st.title("Chatbot with Appointment Booking")  # Display the title of the app
@@ -72,9 +92,6 @@ def main():
     if "user_details" not in st.session_state:
         st.session_state.user_details = {"Name": "", "Email": "", "Phone Number": "", "Appointment Date": ""}  # Store user details
 
-    # Initialize the LangChain agent
-    agent = initialize_chatbot_agent()
-
     # Display chat history
     st.write("### Chat History")
     for query, response, _ in st.session_state.responses:
@@ -110,7 +127,7 @@ def main():
                     st.session_state.responses.append((query_text, "Sure! What's your name?", None))  # Respond asking for name
                 else:
                     try:
-                        response = agent.run(query_text)  # Get agent's response
+                        response = run_agent_turn(query_text)  # Get agent's response
                         st.session_state.responses.append((query_text, response, None))  # Store response
                     except Exception as e:
                         st.session_state.responses.append(
@@ -167,7 +184,7 @@ def main():
                     )
 
                     # Execute the agent's response
-                    agent_response = agent.run(agent_query)
+                    agent_response = run_agent_turn(agent_query)
                     st.session_state.responses.append((appointment_text, agent_response, None))
 
                     # Reset form state after successful completion
@@ -179,6 +196,15 @@ def main():
                     )
                 st.rerun()
 
+    # The UI is up: pre-load the models and vector store in the background
+    start_warmup()
+
+    # Show where start-up time went (imports and model/vector store initialisation)
+    with st.sidebar.expander("Startup timings"):
+        st.text(timing_report())
+        if "tool_cache" in st.session_state:
+            st.text(st.session_state.tool_cache.report())  # Tool executions avoided by memoization
+
 # Run the chatbot app when this script is executed
 if __name__ == "__main__":
     main()
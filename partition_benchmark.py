@@ -0,0 +1,93 @@
+#Importing the dependencies
+import math          # For normalising synthetic embeddings
+import random        # For generating synthetic embeddings
+import statistics    # For median query latency
+import time          # For timing queries
+
+import chromadb      # Chroma client (installed with langchain_chroma)
+from document_processing import build_partition_router, compute_centroid, search_partitions
+
+# Benchmark settings: synthetic corpus grown one partition (document) at a time
+DIMENSIONS = 768                       # Same size as nomic-embed-text embeddings
+CHUNKS_PER_PARTITION = 200             # Chunks per source document
+PARTITION_COUNTS = [2, 4, 8, 16, 32]   # Corpus sizes to measure, in partitions
+QUERIES = 50                           # Queries timed at each corpus size
+K = 5                                  # Results per query, as in query_document_tool
+THEMES = 8                             # Shared topics; each document mixes two, so documents overlap
+NOISE = 0.03                           # Per-dimension noise; comparable to the topic signal, so routing can miss
+
+# Function to scale a vector to unit length
+def normalise(vector):
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector]
+
+# Function to generate a noisy embedding around a document's topic vector
+def noisy(rng, center, noise=NOISE):
+    return normalise([c + rng.gauss(0, noise) for c in center])
+
+# Function to build a document's topic vector as a weighted mix of two shared themes
+def mixed_topic(rng, themes):
+    first, second = rng.sample(themes, 2)
+    weight = rng.uniform(0.5, 1.0)
+    return normalise([weight * a + (1 - weight) * b for a, b in zip(first, second)])
+
+# Function to return the median latency (ms) of a search function and its results per query
+def time_queries(search, queries):
+    timings = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, results
+
+# Function to search one Chroma collection, returning (id, distance) pairs
+def query_collection(collection, query, k):
+    found = collection.query(query_embeddings=[query], n_results=k)
+    return list(zip(found["ids"][0], found["distances"][0]))
+
+# Compare a single-collection search with the shipped centroid-routed search as the corpus grows
+def run_benchmark():
+    rng = random.Random(0)
+    client = chromadb.EphemeralClient()
+    single = client.create_collection("benchmark-single")  # One HNSW index over the corpus, as before partitioning
+    themes = [normalise([rng.gauss(0, 1) for _ in range(DIMENSIONS)]) for _ in range(THEMES)]
+    partitions = {}  # name -> (collection, topic vector)
+    index = {}       # name -> centroid summary, as in the partition index
+
+    print(f"{'chunks':>8}  {'partitions':>10}  {'single ms':>12}  {'routed ms':>10}  {f'recall@{K}':>9}")
+    for count in PARTITION_COUNTS:
+        # Grow the corpus to the next size
+        while len(partitions) < count:
+            name = f"benchmark-part-{len(partitions)}"
+            center = mixed_topic(rng, themes)
+            vectors = [noisy(rng, center) for _ in range(CHUNKS_PER_PARTITION)]
+            ids = [f"{name}:{i}" for i in range(CHUNKS_PER_PARTITION)]
+
+            collection = client.create_collection(name)
+            collection.add(ids=ids, embeddings=vectors)
+            single.add(ids=ids, embeddings=vectors)
+            partitions[name] = (collection, center)
+            index[name] = {"centroid": compute_centroid(vectors)}
+
+        router = build_partition_router(index)  # Rebuilt after each growth step, as after ingestion
+        queries = [noisy(rng, rng.choice(list(partitions.values()))[1]) for _ in range(QUERIES)]
+
+        # Routed search goes through search_partitions, the same routing and merge as search_documents
+        def routed_search(query):
+            return search_partitions(
+                query, router, lambda name, q, k: query_collection(partitions[name][0], q, k), k=K
+            )
+
+        single_ms, single_results = time_queries(lambda query: query_collection(single, query, K), queries)
+        routed_ms, routed_results = time_queries(routed_search, queries)
+
+        # Recall@K: share of the single collection's top K that the routed search also returns
+        recall = statistics.mean(
+            len({doc_id for doc_id, _ in routed} & {doc_id for doc_id, _ in expected}) / K
+            for routed, expected in zip(routed_results, single_results)
+        )
+        print(f"{count * CHUNKS_PER_PARTITION:>8}  {count:>10}  {single_ms:>12.2f}  {routed_ms:>10.2f}  {recall:>9.2f}")
+
+if __name__ == "__main__":
+    run_benchmark()  # Execute the benchmark when the script is run
@@ -0,0 +1,100 @@
+#Importing the dependencies
+import importlib   # For importing heavy modules on first use
+import sys         # For checking which modules are already loaded
+import threading   # For the background warm-up thread and shared-state locks
+import time        # For measuring import and initialisation costs
+from contextlib import contextmanager
+
+# Import and initialisation costs recorded so far, keyed by label (e.g. "import langchain_ollama") in seconds
+startup_timings = {}
+# Background warm-up costs (model loads only, excluding the imports/inits above)
+warmup_timings = {}
+_timings_lock = threading.Lock()
+
+# Background warm-up thread, started at most once per process
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+# Context manager to record how long a block of startup (or warm-up) work takes
+@contextmanager
+def timed(label, warmup=False):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings = warmup_timings if warmup else startup_timings
+        with _timings_lock:
+            timings.setdefault(label, elapsed)  # Only the first (cold) cost is a startup cost
+
+# Function to import a module on first use and record its import cost
+def lazy_import(module_name):
+    if module_name in sys.modules:
+        # May still be initialising in another thread; import_module waits on the module lock
+        return importlib.import_module(module_name)
+    with timed(f"import {module_name}"):
+        return importlib.import_module(module_name)
+
+# Function to format a group of timings as report lines with a total
+def _format_timings(title, timings, width):
+    lines = [title]
+    lines += [f"  {label.ljust(width)}  {seconds * 1000:8.1f} ms" for label, seconds in timings]
+    total = sum(seconds for _, seconds in timings)
+    lines.append(f"  {'total'.ljust(width)}  {total * 1000:8.1f} ms")
+    return lines
+
+# Function to format the recorded timings as a plain-text report
+def timing_report():
+    with _timings_lock:
+        startup = list(startup_timings.items())
+        warmup = list(warmup_timings.items())
+    if not startup and not warmup:
+        return "No startup timings recorded yet."
+
+    # Import/init entries never nest, and warm-up entries exclude them, so each total counts work once
+    width = max(len(label) for label, _ in startup + warmup)
+    lines = _format_timings("Imports and initialisation:", startup, width)
+    if warmup:
+        lines += _format_timings("Background warm-up:", warmup, width)
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        lines.append("(warm-up still running)")
+    return "\n".join(lines)
+
+# Warm-up work: load the Ollama models and open the vector store before the first query needs them
+def _warm_up():
+    # Imported here to avoid a circular import (both modules import this one)
+    from document_processing import open_vector_store, get_embedding_function
+    from agent_tools import get_llm
+
+    # Imports and inits are timed where they happen; only the model loads are timed here
+    def load_embedding_model():
+        embeddings = get_embedding_function()
+        with timed("load nomic-embed-text", warmup=True):
+            embeddings.embed_query("warm-up")
+
+    def load_llm():
+        llm = get_llm()
+        with timed("load mistral", warmup=True):
+            llm.invoke("")  # Empty prompt only loads the model
+
+    steps = [
+        ("langchain.agents", lambda: lazy_import("langchain.agents")),
+        ("nomic-embed-text", load_embedding_model),
+        ("Chroma vector store", open_vector_store),
+        ("mistral", load_llm),
+    ]
+    for label, step in steps:
+        try:
+            step()
+        except Exception as e:
+            # Warm-up is best effort; the first real use will surface any error to the user
+            print(f"Debug: warm-up {label} failed: {e}")
+
+# Function to start the background warm-up thread once the UI has rendered
+def start_warmup():
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="chatbot-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
@@ -0,0 +1,109 @@
+#Importing the dependencies
+from datetime import datetime
+
+from tool_cache import ToolCallCache, normalise_booking_input, normalise_tool_input
+
+# A booking as the agent might send it to Create Event / Send Email
+BOOKING = '{"name": "John Doe", "email": "John.Doe@Example.com", "phone": "+1 234-567", "appointment_date": "2026-10-20T10:00:00"}'
+
+# Helper to wrap a fake tool that counts its executions and returns fixed results
+def counting_tool(*results):
+    calls = []
+
+    def tool(tool_input):
+        calls.append(tool_input)
+        return results[min(len(calls), len(results)) - 1]
+
+    return tool, calls
+
+def test_booking_key_ignores_equivalent_spellings():
+    variant = "{'Name': ' john  doe', 'email': 'john.doe@example.com ', 'phone': '+1234567', 'appointment_date': '2026-10-20 10:00'}"
+    assert normalise_booking_input(BOOKING) == normalise_booking_input(variant)
+
+def test_booking_key_accepts_dict_and_datetime():
+    booking = {"name": "John Doe", "email": "john.doe@example.com", "phone": "+1234567",
+               "appointment_date": datetime(2026, 10, 20, 10, 0)}
+    assert normalise_booking_input(booking) == normalise_booking_input(BOOKING)
+
+def test_booking_key_distinguishes_different_bookings():
+    other_date = BOOKING.replace("2026-10-20T10:00:00", "2026-10-21T10:00:00")
+    other_phone = BOOKING.replace("+1 234-567", "+1 234-568")
+    assert normalise_booking_input(other_date) != normalise_booking_input(BOOKING)
+    assert normalise_booking_input(other_phone) != normalise_booking_input(BOOKING)
+
+def test_tool_key_normalises_free_text():
+    assert normalise_tool_input('  "What is  Big Data?" ') == normalise_tool_input("what is big data?")
+
+def test_unparseable_dict_input_falls_back_to_text():
+    assert normalise_tool_input("{[1]: 2}") == "{[1]: 2}"
+    assert normalise_booking_input("{[1]: 2}") == "{[1]: 2}"
+
+def test_equivalent_booking_is_replayed():
+    cache = ToolCallCache()
+    tool, calls = counting_tool("Appointment scheduled for 2026-10-20 10:00:00.")
+    create_event = cache.wrap("Create Event", tool, side_effecting=True)
+
+    first = create_event(BOOKING)
+    second = create_event(BOOKING.replace("2026-10-20T10:00:00", "2026-10-20 10:00"))
+    assert second == first
+    assert len(calls) == 1
+    assert cache.calls == 2
+    assert cache.avoided == 1
+    assert cache.avoided_by_tool == {"Create Event": 1}
+
+def test_failed_side_effecting_result_is_rerun():
+    cache = ToolCallCache()
+    tool, calls = counting_tool("Error: Failed to send email due to: timeout", "Success: Email sent successfully!")
+    send_email = cache.wrap("Send Email", tool, side_effecting=True)
+
+    assert send_email(BOOKING).startswith("Error")
+    assert send_email(BOOKING).startswith("Success")
+    assert send_email(BOOKING).startswith("Success")
+    assert len(calls) == 2
+    assert cache.avoided == 1
+
+def test_new_turn_clears_cache():
+    cache = ToolCallCache()
+    tool, calls = counting_tool("context")
+    query_document = cache.wrap("Query Document", tool)
+
+    query_document("big data")
+    query_document("Big Data")
+    cache.new_turn()
+    query_document("big data")
+    assert len(calls) == 2
+    assert cache.calls == 3
+    assert cache.avoided == 1
+
+def test_key_failure_runs_tool_uncached():
+    cache = ToolCallCache()
+    calls = []
+
+    class Unprintable:
+        def __str__(self):
+            raise RuntimeError("no key")
+
+    def tool(tool_input):
+        calls.append(tool_input)
+        return "Invalid input"
+
+    create_event = cache.wrap("Create Event", tool, side_effecting=True)
+    assert create_event(Unprintable()) == "Invalid input"
+    assert create_event(Unprintable()) == "Invalid input"
+    assert len(calls) == 2
+    assert cache.avoided == 0
+
+def test_avoided_counters_per_tool():
+    cache = ToolCallCache()
+    parse_date = cache.wrap("Parse Date", counting_tool(None)[0])
+    query_document = cache.wrap("Query Document", counting_tool("context")[0])
+
+    parse_date("next monday")
+    parse_date("Next Monday")
+    parse_date("next  monday")
+    query_document("chapter 1")
+    query_document("chapter 1")
+    assert cache.calls == 5
+    assert cache.avoided == 3
+    assert cache.avoided_by_tool == {"Parse Date": 2, "Query Document": 1}
+    assert cache.report() == "Tool calls: 5, avoided: 3 (Parse Date: 2, Query Document: 1)"
@@ -0,0 +1,111 @@
+#Importing the dependencies
+import ast    # For parsing dictionary-like tool inputs written as Python literals
+import json   # For parsing JSON tool inputs and building canonical cache keys
+import re     # For collapsing whitespace in free-text inputs
+from datetime import datetime  # For canonicalising appointment dates
+
+# Prefixes of tool results that report a failure; these are never replayed so the agent can retry
+FAILURE_PREFIXES = ("error", "invalid", "failed")
+
+# Function to parse dictionary-like inputs (Create Event, Send Email) given as dicts, JSON or Python literals
+def _parse_dict_input(tool_input):
+    if isinstance(tool_input, str):
+        text = tool_input.strip()
+        if text.startswith("{"):
+            for parse in (json.loads, ast.literal_eval):
+                try:
+                    return parse(text)
+                except Exception:
+                    continue  # Not parseable here; the tool itself reports bad input
+    return tool_input
+
+# Function to turn a tool input into a canonical cache key
+def normalise_tool_input(tool_input, casefold=True):
+    parsed = _parse_dict_input(tool_input)
+    if isinstance(parsed, dict):
+        cleaned = {
+            str(key).strip().lower(): " ".join(str(value).split())
+            for key, value in parsed.items()
+        }
+        return json.dumps(cleaned, sort_keys=True)
+
+    # Free-text inputs (Query Document, Parse Date): ignore case, quotes and extra whitespace
+    text = re.sub(r"\s+", " ", str(tool_input)).strip().strip("\"'").strip()
+    return text.casefold() if casefold else text
+
+# Function to canonicalise an appointment date so equivalent spellings share a key
+def _canonical_date(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    text = " ".join(str(value).split())
+    try:
+        return datetime.fromisoformat(text).isoformat()  # "2026-10-20 10:00" == "2026-10-20T10:00:00"
+    except ValueError:
+        return text.casefold()
+
+# Function to build the cache key for booking inputs (Create Event, Send Email) from canonical fields
+def normalise_booking_input(tool_input):
+    parsed = _parse_dict_input(tool_input)
+    if not isinstance(parsed, dict):
+        return normalise_tool_input(tool_input, casefold=False)
+
+    canonical = {}
+    for key, value in parsed.items():
+        key = str(key).strip().lower()
+        if key == "appointment_date":
+            canonical[key] = _canonical_date(value)
+        elif key == "email":
+            canonical[key] = str(value).strip().lower()
+        elif key == "phone":
+            canonical[key] = re.sub(r"[^\d+]", "", str(value))  # Drop spaces, dashes and brackets
+        else:
+            canonical[key] = " ".join(str(value).split()).casefold()
+    return json.dumps(canonical, sort_keys=True)
+
+# Memoizes agent tool calls for the duration of one agent turn
+class ToolCallCache:
+    def __init__(self):
+        self._results = {}      # (tool name, normalised input) -> result for the current turn
+        self.calls = 0          # Tool calls seen, including replayed ones
+        self.avoided = 0        # Tool executions skipped because the result was replayed
+        self.avoided_by_tool = {}
+
+    # Start a new agent turn; results from the previous turn are dropped
+    def new_turn(self):
+        self._results.clear()
+
+    # Wrap a tool function so repeated calls with the same input in a turn reuse the first result
+    def wrap(self, name, func, side_effecting=False):
+        def memoized(tool_input):
+            self.calls += 1
+            # Side-effecting tools are keyed on canonical booking fields (date, email, phone, name)
+            normalise = normalise_booking_input if side_effecting else normalise_tool_input
+            try:
+                key = (name, normalise(tool_input))
+            except Exception as e:
+                # The cache must never fail a call the tool itself would handle: run it uncached
+                print(f"Debug: Could not build cache key for {name}: {e}")
+                return func(tool_input)
+            if key in self._results:
+                self.avoided += 1
+                self.avoided_by_tool[name] = self.avoided_by_tool.get(name, 0) + 1
+                print(f"Debug: Reusing result of {name} for repeated input: {tool_input}")
+                return self._results[key]
+
+            result = func(tool_input)
+
+            # Side-effecting tools are made idempotent: only a successful call is replayed,
+            # so a repeated Create Event / Send Email cannot book or send twice in one turn
+            if side_effecting and str(result).strip().lower().startswith(FAILURE_PREFIXES):
+                return result
+            self._results[key] = result
+            return result
+
+        return memoized
+
+    # Summarise how many tool executions were avoided
+    def report(self):
+        if not self.avoided:
+            return f"Tool calls: {self.calls}, none avoided."
+        per_tool = ", ".join(f"{name}: {count}" for name, count in sorted(self.avoided_by_tool.items()))
+        return f"Tool calls: {self.calls}, avoided: {self.avoided} ({per_tool})"